@@ -1,10 +1,53 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
+import atexit
+import logging
+import logging.handlers
+import queue
 
 from app.routers import excerpts
 from app.routers import audio
 
-app = FastAPI()
+from app.services.excerpt_service import get_stem_index
+
+
+def _configure_logging():
+    """Route log records through a queue so handler I/O happens on a
+    background thread instead of blocking the event loop."""
+    log_queue: queue.Queue = queue.Queue(-1)
+    handler = logging.StreamHandler()
+    handler.setFormatter(
+        logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s")
+    )
+    listener = logging.handlers.QueueListener(log_queue, handler)
+    listener.start()
+    atexit.register(listener.stop)
+
+    root = logging.getLogger()
+    root.setLevel(logging.INFO)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+
+
+_configure_logging()
+
+try:
+    # uvloop's libuv-backed event loop handles the many small websocket
+    # frames of audio streaming far faster than the default asyncio loop.
+    import uvloop
+    uvloop.install()
+except ImportError:
+    pass
+
+# orjson serializes the excerpt lists several times faster than the
+# stdlib-json default response class
+app = FastAPI(default_response_class=ORJSONResponse)
+
+
+@app.on_event("startup")
+def index_excerpts():
+    """Warm the excerpt index so the first request skips the directory walk."""
+    get_stem_index()
 
 app.add_middleware(
     CORSMiddleware,
@@ -21,3 +64,18 @@ app.include_router(audio.router)
 @app.get("/test")
 def test_endpoint():
     return {"message": "Hello from FastAPI!"}
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    # permessage-deflate shrinks the repetitive JSON analysis frames a
+    # websocket session emits; the binary PCM uploads are near-random and
+    # don't compress, but the win is on the server->client direction.
+    uvicorn.run(
+        "app.main:app",
+        host="0.0.0.0",
+        port=8000,
+        ws="websockets",
+        ws_per_message_deflate=True,
+    )
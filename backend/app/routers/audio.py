@@ -1,9 +1,125 @@
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
-import json
+import asyncio
+import concurrent.futures
+import logging
+import msgpack
+import orjson
+import os
 from app.services.analysis_service import PerformanceAnalyzer
 
+logger = logging.getLogger("audio_ws")
+
 router = APIRouter(prefix="/ws", tags=["websocket"])
 
+# Shared pool for DSP work. Running analyze_chunk inline would block the
+# event loop and stall every other connection; numpy releases the GIL in
+# its C kernels, so a thread pool is enough to keep I/O moving.
+_analysis_pool = concurrent.futures.ThreadPoolExecutor(max_workers=os.cpu_count())
+
+# First byte of a MessagePack-encoded map (fixmap, map16, map32). Control
+# messages are always maps, so this distinguishes them from raw PCM frames.
+_MSGPACK_MAP_PREFIXES = tuple(range(0x80, 0x90)) + (0xDE, 0xDF)
+
+# Most messages the drain phase may collect per iteration. A producer that
+# outruns analysis must not grow the batch without bound and starve the
+# analyze/ack phase.
+_MAX_DRAIN_BATCH = 32
+
+
+def _make_send(websocket: WebSocket, use_msgpack: bool):
+    """Return a send(obj) coroutine factory bound to this connection.
+
+    With the "msgpack" subprotocol negotiated, responses go out as binary
+    MessagePack frames (smaller payloads, no UTF-8 encode); otherwise they
+    fall back to orjson text frames for plain-JSON clients. The msgpack
+    Packer is instantiated once per connection and reused across frames.
+    """
+    if use_msgpack:
+        packer = msgpack.Packer(use_bin_type=True)
+
+        def send(obj):
+            return websocket.send_bytes(packer.pack(obj))
+    else:
+        def send(obj):
+            return websocket.send_text(orjson.dumps(obj).decode())
+
+    return send
+
+
+async def _analyze_batch(send, analyzer: PerformanceAnalyzer, chunks: list,
+                         respond: bool = True):
+    """Run a coalesced batch of PCM chunks through the analyzer.
+
+    With respond=False the analysis still updates the analyzer state (so
+    the final report sees it) but no frame goes back — used for audio
+    drained in the same batch as a disconnect, when nobody is listening.
+    """
+    batched = chunks[0] if len(chunks) == 1 else b"".join(chunks)
+
+    try:
+        # Analyze the coalesced audio off the event loop
+        analysis = await asyncio.get_running_loop().run_in_executor(
+            _analysis_pool, analyzer.analyze_chunk, batched
+        )
+
+        if respond:
+            # Send one combined analysis frame back to the client
+            response = {
+                "status": "analyzed",
+                "batch": len(chunks),
+                "bytes_received": len(batched),
+                "analysis": analysis
+            }
+            await send(response)
+
+    except Exception as e:
+        logger.warning("Error analyzing chunk: %s", e)
+        if respond:
+            # Send error response but keep connection alive
+            error_response = {
+                "status": "error",
+                "message": str(e)
+            }
+            await send(error_response)
+
+
+async def _handle_control(send, analyzer: PerformanceAnalyzer, payload: dict):
+    """Dispatch a decoded control message and send any response."""
+    # Handle special commands
+    if payload.get("command") == "get_summary":
+        # Return performance summary
+        summary = analyzer.get_final_report()
+        response = {
+            "status": "summary",
+            "data": summary
+        }
+        await send(response)
+
+    elif payload.get("command") == "reset":
+        # Reset analyzer
+        analyzer.reset()
+        response = {"status": "reset", "message": "Analyzer reset"}
+        await send(response)
+
+    elif payload.get("command") == "set_note_index":
+        # Update current note index from frontend cursor
+        note_index = payload.get("note_index", 0)
+        logger.debug("[Backend] Received set_note_index: %s", note_index)
+        analyzer.set_current_note_index(note_index)
+        # No need to send response, just acknowledge silently
+
+    elif payload.get("command") == "set_tempo":
+        # Store tempo from frontend (for future rhythm analysis)
+        tempo = payload.get("tempo", 120)
+        logger.debug("[Backend] Received tempo: %s BPM", tempo)
+        analyzer.set_tempo(tempo)
+        # No need to send response, just acknowledge silently
+
+    else:
+        # Generic acknowledgment
+        ack = {"status": "ok", "payload": payload}
+        await send(ack)
+
 
 @router.websocket("/audio/{excerpt_id}/{session_id}")
 async def websocket_audio(websocket: WebSocket, excerpt_id: str, session_id: str):
@@ -20,109 +136,131 @@ async def websocket_audio(websocket: WebSocket, excerpt_id: str, session_id: str
     - (Future) Rhythm accuracy vs. score
     """
     try:
-        await websocket.accept()
-        print(f"WebSocket connected: {excerpt_id}, session: {session_id}")
+        # Negotiate the wire format: clients that offer the "msgpack"
+        # subprotocol get binary MessagePack frames, everyone else gets JSON.
+        use_msgpack = "msgpack" in (websocket.scope.get("subprotocols") or [])
+        await websocket.accept(subprotocol="msgpack" if use_msgpack else None)
+        send = _make_send(websocket, use_msgpack)
+        logger.info("WebSocket connected: %s, session: %s", excerpt_id, session_id)
 
         # Create analyzer for this session
         analyzer = PerformanceAnalyzer(excerpt_id)
     except Exception as e:
-        print(f"Error initializing WebSocket: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error initializing WebSocket")
         try:
             await websocket.close(code=1011, reason=f"Initialization error: {str(e)}")
         except:
             pass
         return
 
+    recv_task: asyncio.Task | None = None
     try:
-        while True:
-            msg = await websocket.receive()
-            msg_type = msg.get("type")
+        disconnected = False
+        while not disconnected:
+            # Phase 1: block until at least one message arrives.
+            if recv_task is None:
+                recv_task = asyncio.ensure_future(websocket.receive())
+            first = await recv_task
+            recv_task = None
+            msgs = [first]
 
-            if msg_type == "websocket.receive":
-                # Binary frames (ArrayBuffer) will be provided in the 'bytes' field
-                if "bytes" in msg and msg["bytes"] is not None:
-                    chunk = msg["bytes"]
+            # Phase 2: drain whatever is already buffered so consecutive
+            # audio chunks get analyzed as one batch instead of paying a
+            # full frame round-trip each. A persistent receive task is
+            # re-armed after every message and harvested only while done:
+            # the sleep(0) tick gives it one event-loop pass, enough to
+            # pick up an already-queued message but never to wait on the
+            # network. (wait_for with timeout=0 cancels the coroutine
+            # before its first step, so it can never see buffered
+            # messages — it must not come back here.)
+            if first.get("type") != "websocket.disconnect":
+                recv_task = asyncio.ensure_future(websocket.receive())
+                await asyncio.sleep(0)
+                while recv_task.done() and len(msgs) < _MAX_DRAIN_BATCH:
+                    msg = recv_task.result()
+                    msgs.append(msg)
+                    if msg.get("type") == "websocket.disconnect":
+                        recv_task = None
+                        break
+                    recv_task = asyncio.ensure_future(websocket.receive())
+                    await asyncio.sleep(0)
 
-                    try:
-                        # Analyze the audio chunk
-                        analysis = analyzer.analyze_chunk(chunk)
+            # Dispatch in arrival order: audio accumulates into one batch,
+            # but any control message (or the disconnect) flushes the
+            # accumulated chunks through the analyzer first, so a command
+            # like get_summary observes everything that preceded it.
+            chunks = []
+            for msg in msgs:
+                if msg.get("type") == "websocket.disconnect":
+                    disconnected = True
+                    if chunks:
+                        # Tail audio still counts toward the final report,
+                        # but nobody is left to receive an ack for it
+                        await _analyze_batch(send, analyzer, chunks, respond=False)
+                        chunks = []
+                    break
 
-                        # Send analysis results back to client
-                        response = {
-                            "status": "analyzed",
-                            "bytes_received": len(chunk),
-                            "analysis": analysis
-                        }
-                        await websocket.send_text(json.dumps(response))
+                # Binary frames (ArrayBuffer) arrive in 'bytes', control
+                # messages in 'text'; one .get() each instead of the old
+                # containment-check-then-index dance.
+                chunk = msg.get("bytes")
+                if chunk is not None:
+                    # Under the msgpack subprotocol, control messages may
+                    # arrive as binary frames too. A MessagePack map prefix
+                    # tells them apart from raw PCM audio.
+                    if use_msgpack and chunk and chunk[0] in _MSGPACK_MAP_PREFIXES:
+                        try:
+                            payload = msgpack.unpackb(chunk, raw=False)
+                        except Exception:
+                            payload = None
+                        if isinstance(payload, dict):
+                            if chunks:
+                                await _analyze_batch(send, analyzer, chunks)
+                                chunks = []
+                            try:
+                                await _handle_control(send, analyzer, payload)
+                            except Exception as e:
+                                error_response = {"status": "error", "message": str(e)}
+                                await send(error_response)
+                            continue
 
-                    except Exception as e:
-                        print(f"Error analyzing chunk: {e}")
-                        # Send error response but keep connection alive
-                        error_response = {
-                            "status": "error",
-                            "message": str(e)
-                        }
-                        await websocket.send_text(json.dumps(error_response))
-
-                elif "text" in msg and msg["text"] is not None:
+                    chunks.append(chunk)
+                    continue
+
+                text = msg.get("text")
+                if text is not None:
+                    if chunks:
+                        await _analyze_batch(send, analyzer, chunks)
+                        chunks = []
                     # Handle text control messages
                     try:
-                        payload = json.loads(msg["text"])
-
-                        # Handle special commands
-                        if payload.get("command") == "get_summary":
-                            # Return performance summary
-                            summary = analyzer.get_final_report()
-                            response = {
-                                "status": "summary",
-                                "data": summary
-                            }
-                            await websocket.send_text(json.dumps(response))
-
-                        elif payload.get("command") == "reset":
-                            # Reset analyzer
-                            analyzer.reset()
-                            response = {"status": "reset", "message": "Analyzer reset"}
-                            await websocket.send_text(json.dumps(response))
-
-                        elif payload.get("command") == "set_note_index":
-                            # Update current note index from frontend cursor
-                            note_index = payload.get("note_index", 0)
-                            print(f"[Backend] Received set_note_index: {note_index}")
-                            analyzer.set_current_note_index(note_index)
-                            # No need to send response, just acknowledge silently
-
-                        elif payload.get("command") == "set_tempo":
-                            # Store tempo from frontend (for future rhythm analysis)
-                            tempo = payload.get("tempo", 120)
-                            print(f"[Backend] Received tempo: {tempo} BPM")
-                            analyzer.set_tempo(tempo)
-                            # No need to send response, just acknowledge silently
-
-                        else:
-                            # Generic acknowledgment
-                            ack = {"status": "ok", "payload": payload}
-                            await websocket.send_text(json.dumps(ack))
+                        payload = orjson.loads(text)
+                        await _handle_control(send, analyzer, payload)
 
                     except Exception as e:
                         error_response = {"status": "error", "message": str(e)}
-                        await websocket.send_text(json.dumps(error_response))
+                        await send(error_response)
+
+            if chunks:
+                await _analyze_batch(send, analyzer, chunks)
 
-            elif msg_type == "websocket.disconnect":
-                final_report = analyzer.get_final_report()
-                print(f"WebSocket disconnected: {session_id}")
-                print(f"Final report: {final_report}")
-                break
+        final_report = analyzer.get_final_report()
+        logger.info("WebSocket disconnected: %s", session_id)
+        logger.debug("Final report: %s", final_report)
 
     except WebSocketDisconnect:
         final_report = analyzer.get_final_report()
-        print(f"WebSocket disconnected: {session_id}")
-        print(f"Final report: {final_report}")
+        logger.info("WebSocket disconnected: %s", session_id)
+        logger.debug("Final report: %s", final_report)
     except Exception as e:
-        print(f"Error in audio websocket for {excerpt_id}, session: {session_id}: {e}")
+        logger.exception(
+            "Error in audio websocket for %s, session: %s", excerpt_id, session_id
+        )
         try:
             await websocket.close(code=1011)
         except Exception:
             pass
+    finally:
+        # Don't leak a pending receive on the way out
+        if recv_task is not None:
+            recv_task.cancel()
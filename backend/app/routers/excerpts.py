@@ -1,139 +1,163 @@
 from fastapi import APIRouter, HTTPException
 from fastapi.responses import Response
-from typing import List
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Optional
+import re
 import zipfile
-import xml.etree.ElementTree as ET
 
 from app.schemas.excerpt_model import ExcerptModel
-from app.services.excerpt_service import get_excerpts_dir, parse_excerpt
+from app.services.excerpt_service import (
+    get_stem_index,
+    parse_excerpt_cached,
+    parse_excerpts_bulk,
+    rebuild_stem_index,
+)
 
 router = APIRouter(prefix="/excerpts", tags=["excerpts"])
 
+# MusicXML root element, with optional namespace prefix. Searching the first
+# few KB of raw bytes replaces a full XML parse just to check the root tag.
+_SCORE_ROOT_RE = re.compile(rb"<\s*(?:\w+:)?score-(?:partwise|timewise)\b")
+
+
+def _resolve_title(index: dict[str, Path], excerpt_title: str) -> Optional[Path]:
+    """Resolve a title to a file path: exact stem match first, then substring.
+
+    Index keys are instrument-qualified relative paths, so the stem is the
+    last path component; one pass finds both the exact and fallback match.
+    """
+    key = excerpt_title.lower()
+    partial = None
+    for rel, path in index.items():
+        stem = rel.rsplit("/", 1)[-1]
+        if stem == key:
+            return path
+        if partial is None and key in stem:
+            partial = path
+    return partial
+
 
 @router.get("/instruments")
-async def get_instruments():
+def get_instruments():
     """Get all available instruments (subdirectories with excerpts)."""
-    excerpts_dir = get_excerpts_dir()
-    instruments = []
+    index = get_stem_index()
 
-    for item in excerpts_dir.iterdir():
-        if item.is_dir() and any(item.glob("*.mxl")):
-            instruments.append(item.name.title())  # Capitalize first letter
+    # Capitalize first letter of each directory name
+    instruments = {path.parent.name.title() for path in index.values()}
 
     return sorted(instruments)
 
 
-@router.get("/", response_model=List[ExcerptModel])
-async def get_all_excerpts():
-    """Get all available excerpts."""
-    excerpts_dir = get_excerpts_dir()
-    excerpts = []
+@router.post("/reindex")
+def reindex_excerpts():
+    """Rebuild the excerpt index after files change on disk."""
+    index = rebuild_stem_index()
+    return {"status": "ok", "count": len(index)}
 
-    # Search recursively for .mxl files in subdirectories
-    for file_path in excerpts_dir.rglob("*.mxl"):
-        try:
-            excerpt = parse_excerpt(file_path)
-            if excerpt:
-                excerpts.append(excerpt)
-        except Exception:
-            # Skip files that can't be parsed
-            continue
 
-    return excerpts
+@router.get("/", response_model=List[ExcerptModel], response_model_exclude_none=True)
+def get_all_excerpts():
+    """Get all available excerpts."""
+    # Cold parses fan out across a process pool; cache-warm files skip it
+    return parse_excerpts_bulk(list(get_stem_index().values()))
 
 
 @router.get("/{excerpt_title}", response_model=ExcerptModel)
-async def get_excerpt_by_title(excerpt_title: str):
+def get_excerpt_by_title(excerpt_title: str):
     """Get a specific excerpt by title."""
-    excerpts_dir = get_excerpts_dir()
+    file_path = _resolve_title(get_stem_index(), excerpt_title)
 
-    # Look for files that match the title (search recursively)
-    for file_path in excerpts_dir.rglob("*.mxl"):
-        if excerpt_title.lower() in file_path.stem.lower():
-            try:
-                excerpt = parse_excerpt(file_path)
-                if excerpt:
-                    return excerpt
-            except Exception as e:
-                raise HTTPException(
-                    status_code=500, detail=f"Error parsing excerpt: {e}"
-                )
+    if file_path is not None:
+        try:
+            excerpt = parse_excerpt_cached(file_path)
+            if excerpt:
+                return excerpt
+        except Exception as e:
+            raise HTTPException(
+                status_code=500, detail=f"Error parsing excerpt: {e}"
+            )
 
     raise HTTPException(status_code=404, detail="Excerpt not found")
 
 
+@lru_cache(maxsize=128)
+def _extract_musicxml(path_str: str, mtime_ns: int) -> bytes:
+    """Extract the score XML bytes from an .mxl archive.
+
+    Cached on (path, mtime) so warm requests become a dict hit; a changed
+    file gets a new mtime and therefore a fresh extraction.
+    """
+    # Extract MusicXML from .mxl file (which is a compressed format)
+    with zipfile.ZipFile(path_str, "r") as zip_file:
+        # Look for the main MusicXML file in the archive
+        xml_files = [
+            name for name in zip_file.namelist() if name.endswith(".xml")
+        ]
+        if not xml_files:
+            raise ValueError("No XML file found in MXL archive")
+
+        # Probe likely candidates first: container metadata under
+        # META-INF is never the score itself.
+        xml_files.sort(key=lambda name: name.startswith("META-INF/"))
+
+        # Find the best MusicXML file by regex-probing the first few KB
+        # of each member for the root element. Each member is inflated at
+        # most once: the bytes read for the probe are the bytes returned,
+        # and the first member read doubles as the fallback.
+        first_bytes = None
+        xml_bytes = None
+
+        for xml_file in xml_files:
+            try:
+                raw = zip_file.read(xml_file)
+            except Exception:
+                continue
+
+            if first_bytes is None:
+                first_bytes = raw
+
+            if _SCORE_ROOT_RE.search(raw[:4096]):
+                xml_bytes = raw
+                break
+
+        # Fallback to first readable XML file if no valid MusicXML found
+        if xml_bytes is None:
+            xml_bytes = first_bytes
+
+        if xml_bytes is None:
+            raise ValueError("No readable XML file in MXL archive")
+
+    # Validate that we have some content
+    if len(xml_bytes.strip()) < 50:
+        raise ValueError("Extracted XML content is empty or too short")
+
+    return xml_bytes
+
+
 @router.get("/{excerpt_title}/musicxml")
-async def get_excerpt_musicxml(excerpt_title: str):
+def get_excerpt_musicxml(excerpt_title: str):
     """Get the raw MusicXML content for a specific excerpt."""
-    excerpts_dir = get_excerpts_dir()
+    file_path = _resolve_title(get_stem_index(), excerpt_title)
 
-    # Look for files that match the title (search recursively)
-    for file_path in excerpts_dir.rglob("*.mxl"):
-        if excerpt_title.lower() in file_path.stem.lower():
-            try:
-                # Extract MusicXML from .mxl file (which is a compressed format)
-                with zipfile.ZipFile(file_path, "r") as zip_file:
-                    # Look for the main MusicXML file in the archive
-                    xml_files = [
-                        name for name in zip_file.namelist() if name.endswith(".xml")
-                    ]
-                    if not xml_files:
-                        raise HTTPException(
-                            status_code=500, detail="No XML file found in MXL archive"
-                        )
-
-                    xml_content = None
-
-                    # Try to find the best MusicXML file
-                    for xml_file in xml_files:
-                        try:
-                            content = zip_file.read(xml_file).decode("utf-8")
-
-                            # Try to parse as XML to validate structure
-                            try:
-                                root = ET.fromstring(content)
-                                # Check for MusicXML root elements
-                                if (
-                                    root.tag.endswith("score-partwise")
-                                    or "score-partwise" in root.tag
-                                ):
-                                    xml_content = content
-                                    break
-                                elif (
-                                    root.tag.endswith("score-timewise")
-                                    or "score-timewise" in root.tag
-                                ):
-                                    xml_content = content
-                                    break
-                            except ET.ParseError:
-                                continue
-
-                        except Exception:
-                            continue
-
-                    # Fallback to first XML file if no valid MusicXML found
-                    if xml_content is None:
-                        main_xml = xml_files[0]
-                        xml_content = zip_file.read(main_xml).decode("utf-8")
-
-                    # Validate that we have some content
-                    if not xml_content or len(xml_content.strip()) < 50:
-                        raise HTTPException(
-                            status_code=500,
-                            detail="Extracted XML content is empty or too short",
-                        )
-
-                    return Response(
-                        content=xml_content,
-                        media_type="application/xml",
-                        headers={
-                            "Content-Disposition": f'inline; filename="{file_path.stem}.xml"'
-                        },
-                    )
-
-            except Exception as e:
-                raise HTTPException(
-                    status_code=500, detail=f"Error reading MusicXML: {e}"
-                )
+    if file_path is not None:
+        try:
+            xml_bytes = _extract_musicxml(
+                str(file_path), file_path.stat().st_mtime_ns
+            )
+
+            # Return the undecoded bytes; Starlette sends them as-is
+            return Response(
+                content=xml_bytes,
+                media_type="application/xml",
+                headers={
+                    "Content-Disposition": f'inline; filename="{file_path.stem}.xml"'
+                },
+            )
+
+        except Exception as e:
+            raise HTTPException(
+                status_code=500, detail=f"Error reading MusicXML: {e}"
+            )
 
     raise HTTPException(status_code=404, detail="Excerpt not found")
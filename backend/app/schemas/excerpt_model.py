@@ -1,9 +1,12 @@
 from pydantic import BaseModel, ConfigDict, Field
-from typing import List, Optional
+from typing import Annotated, List, Literal, Optional
 
 
 class NoteModel(BaseModel):
-    model_config = ConfigDict(from_attributes=True, validate_by_name=True)
+    # Frozen: tokens are built once at parse time and shared through the
+    # excerpt cache afterwards.
+    model_config = ConfigDict(from_attributes=True, validate_by_name=True, frozen=True)
+    kind: Literal["note"] = Field("note", description="Discriminator tag")
     pitch: str = Field(..., description="The pitch of the note (e.g., C4, D#5)")
     duration_quarter: float = Field(
         ..., description="Duration of the note in quarter lengths"
@@ -12,14 +15,32 @@ class NoteModel(BaseModel):
 
 
 class RestModel(BaseModel):
-    model_config = ConfigDict(from_attributes=True, validate_by_name=True)
+    model_config = ConfigDict(from_attributes=True, validate_by_name=True, frozen=True)
+    kind: Literal["rest"] = Field("rest", description="Discriminator tag")
     duration_quarter: float = Field(
         ..., description="Duration of the rest in quarter lengths"
     )
     offset: float = Field(..., description="Offset of the rest in quarter lengths")
 
 
-NoteOrRest = NoteModel | RestModel
+# The kind tag lets Pydantic use its discriminated-union fast path when
+# validating long notes_and_rests lists, instead of trying each variant.
+NoteOrRest = Annotated[NoteModel | RestModel, Field(discriminator="kind")]
+
+
+class ExpectedNotes(BaseModel):
+    """Parallel arrays of the playable notes, precomputed at parse time.
+
+    Struct-of-arrays companion to notes_and_rests: rests are filtered out
+    and frequencies resolved once, so the analyzer never re-iterates the
+    token list. Excluded from serialization — it is derived data.
+    """
+
+    model_config = ConfigDict(frozen=True)
+    pitch_names: List[str] = Field(..., description="Pitch names in score order")
+    frequencies: List[float] = Field(..., description="Frequencies in Hz")
+    offsets: List[float] = Field(..., description="Offsets in quarter lengths")
+    durations: List[float] = Field(..., description="Durations in quarter lengths")
 
 
 class ExcerptModel(BaseModel):
@@ -44,3 +65,8 @@ class ExcerptModel(BaseModel):
         None, description="Time signature of the excerpt"
     )
     tempo: Optional[int] = Field(None, description="Tempo of the excerpt in BPM")
+    expected: Optional[ExpectedNotes] = Field(
+        None,
+        exclude=True,
+        description="Precomputed note arrays for the analyzer; never serialized",
+    )
@@ -1,6 +1,8 @@
 from .analysis_service import note_to_frequency, AudioAnalyzer, PerformanceAnalyzer
 from .excerpt_service import (
     parse_excerpt,
+    parse_excerpt_cached,
+    parse_excerpts_bulk,
     get_excerpts_dir,
     get_project_root,
     EXCERPTS_DIR,
@@ -8,6 +10,8 @@ from .excerpt_service import (
 
 __all__ = [
     "parse_excerpt",
+    "parse_excerpt_cached",
+    "parse_excerpts_bulk",
     "get_excerpts_dir",
     "get_project_root",
     "EXCERPTS_DIR",
@@ -8,11 +8,128 @@ This service processes audio chunks from WebSocket streams and provides:
 - Note onset detection
 """
 
+import logging
+import math
+
 import numpy as np
 from typing import Optional, Dict, Any, List
 
 from app.schemas.excerpt_model import ExcerptModel
-from app.services.excerpt_service import parse_excerpt, get_excerpts_dir, find_excerpt_by_title
+from app.services.excerpt_service import parse_excerpt_cached, get_excerpts_dir, find_excerpt_by_title
+
+# Diagnostics on the per-chunk path use %-formatting (and a single
+# isEnabledFor gate where several records fire at once) so a disabled
+# level costs nothing per chunk.
+logger = logging.getLogger(__name__)
+
+
+# Note to semitone mapping (C0 = 0)
+_NOTE_MAP = {
+    'C': 0, 'C#': 1, 'Db': 1, 'D': 2, 'D#': 3, 'Eb': 3,
+    'E': 4, 'F': 5, 'F#': 6, 'Gb': 6, 'G': 7, 'G#': 8,
+    'Ab': 8, 'A': 9, 'A#': 10, 'Bb': 10, 'B': 11
+}
+
+# music21 spells flats with '-' (Pitch("B-4").nameWithOctave == "B-4"),
+# so parse-time lookups need these spellings too. C- and F- wrap to the
+# neighboring natural via their negative/next semitone.
+_FLAT_NOTE_MAP = {
+    'C-': -1, 'D-': 1, 'E-': 3, 'F-': 4, 'G-': 6, 'A-': 8, 'B-': 10
+}
+
+
+def _build_note_frequencies() -> Dict[str, float]:
+    """Precompute frequency for every spelling and octave in MIDI range."""
+    freqs = {}
+    for octave in range(-1, 10):
+        for name, semitone in _NOTE_MAP.items():
+            # MIDI note number; A4 = 440 Hz is MIDI note 69
+            midi_note = (octave + 1) * 12 + semitone
+            freqs[f"{name}{octave}"] = 440.0 * (2.0 ** ((midi_note - 69) / 12.0))
+
+    # The '-' spellings only cover octaves 0-9: in octave -1 the key
+    # "E-1" would mean both E(-1) and E-flat 1, and this second pass
+    # deliberately wins that collision for the music21 reading.
+    for octave in range(0, 10):
+        for name, semitone in _FLAT_NOTE_MAP.items():
+            midi_note = (octave + 1) * 12 + semitone
+            freqs[f"{name}{octave}"] = 440.0 * (2.0 ** ((midi_note - 69) / 12.0))
+    return freqs
+
+
+# Built once at import: note_to_frequency becomes a single dict hit instead
+# of string parsing, exception-driven control flow, and a pow() per call.
+NOTE_FREQ: Dict[str, float] = _build_note_frequencies()
+
+# Chromatic spellings indexed by midi % 12
+NOTE_NAMES = ('C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B')
+
+# 16-bit PCM normalization factor, pre-boxed as float32 so the fused
+# convert-and-scale multiply stays in single precision
+_PCM_SCALE = np.float32(1.0 / 32768.0)
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+if njit is not None:
+    @njit(cache=True, fastmath=True)
+    def _acf_peak_kernel(
+        acf: np.ndarray,
+        min_period: int,
+        max_period: int,
+        peak_threshold: float,
+        sample_rate: float,
+    ) -> float:
+        """Fused normalize-and-peak-scan over a raw autocorrelation.
+
+        Typed loops with an early break replace the numpy mask pipeline;
+        the threshold is scaled by acf[0] so no normalized copy of the
+        array is materialized. Returns the frequency in Hz, or -1.0 when
+        no pitch is found.
+        """
+        c0 = acf[0]
+        if c0 <= 0.0:
+            return -1.0
+
+        threshold = peak_threshold * c0
+
+        # First local maximum above the threshold
+        peak_index = -1
+        for i in range(min_period + 1, max_period - 1):
+            if acf[i] > acf[i - 1] and acf[i] > acf[i + 1] and acf[i] > threshold:
+                peak_index = i
+                break
+
+        # Fall back to the global maximum of the search range
+        if peak_index < 0:
+            best = min_period
+            for i in range(min_period + 1, max_period):
+                if acf[i] > acf[best]:
+                    best = i
+            peak_index = best
+
+        if peak_index <= 0:
+            return -1.0
+
+        frequency = sample_rate / peak_index
+        if 50.0 <= frequency <= 2000.0:
+            return frequency
+        return -1.0
+
+    @njit(cache=True, fastmath=True)
+    def _pcm16_to_float(src: np.ndarray, dst: np.ndarray, scale: np.float32) -> None:
+        """Fused int16 -> scaled float32 decode, one pass, no temporaries.
+
+        The trivial loop auto-vectorizes to SIMD; it replaces numpy's
+        casting ufunc dispatch on the per-chunk decode path.
+        """
+        for i in range(src.size):
+            dst[i] = src[i] * scale
+else:
+    _acf_peak_kernel = None
+    _pcm16_to_float = None
 
 
 def note_to_frequency(note_name: str) -> Optional[float]:
@@ -28,38 +145,7 @@ def note_to_frequency(note_name: str) -> Optional[float]:
     if note_name == "rest" or not note_name:
         return None
 
-    # Note to semitone mapping (C0 = 0)
-    note_map = {
-        'C': 0, 'C#': 1, 'Db': 1, 'D': 2, 'D#': 3, 'Eb': 3,
-        'E': 4, 'F': 5, 'F#': 6, 'Gb': 6, 'G': 7, 'G#': 8,
-        'Ab': 8, 'A': 9, 'A#': 10, 'Bb': 10, 'B': 11
-    }
-
-    try:
-        # Parse note name (e.g., "C4", "F#5", "Bb3")
-        # Handle both sharp (#) and flat (b) notation
-        if len(note_name) >= 2:
-            if note_name[1] in ['#', 'b']:
-                note = note_name[:2]
-                octave = int(note_name[2:])
-            else:
-                note = note_name[0]
-                octave = int(note_name[1:])
-
-            if note not in note_map:
-                return None
-
-            # Calculate MIDI note number
-            midi_note = (octave + 1) * 12 + note_map[note]
-
-            # Convert MIDI note to frequency (A4 = 440 Hz is MIDI note 69)
-            frequency = 440.0 * (2.0 ** ((midi_note - 69) / 12.0))
-
-            return frequency
-    except (ValueError, IndexError):
-        return None
-
-    return None
+    return NOTE_FREQ.get(note_name)
 
 
 class AudioAnalyzer:
@@ -81,17 +167,32 @@ class AudioAnalyzer:
         self.chunk_size = chunk_size
         self.total_bytes = 0
 
-        # Pitch detection buffer (accumulate multiple chunks)
-        self.pitch_detection_buffer: np.ndarray = np.array([], dtype=np.float32)
+        # Pitch detection buffer (accumulate multiple chunks). A fixed
+        # preallocated ring avoids the per-chunk concatenate-and-slice
+        # reallocation of a growing array.
         self.min_samples_for_pitch = 2048  # Need at least this many samples for reliable pitch detection
+        self._pitch_ring = np.empty(self.min_samples_for_pitch, dtype=np.float32)
+        self._pitch_write = 0  # next write position in the ring
+        self._pitch_filled = 0  # valid samples currently in the ring
+        # Contiguous scratch the ring is unrolled into for detection
+        self._pitch_window = np.empty(self.min_samples_for_pitch, dtype=np.float32)
+
+        # Reusable float32 scratch for normalized samples; grown on demand
+        # when a coalesced batch exceeds the nominal chunk size
+        self._scratch = np.empty(self.chunk_size, dtype=np.float32)
 
         # Analysis state - adaptive RMS + slope onset detection
         self.onset_detected = False  # Track if we've detected the main onset
         self.onset_time: Optional[float] = None  # Time of the main onset
 
         # Adaptive onset detection parameters - slightly less strict but still robust
-        self.rms_history: List[float] = []  # Rolling window of RMS values
         self.rms_window_size = 50  # Number of RMS values to keep for slope calculation (much longer)
+        # Rolling window of RMS values as a fixed float32 ring: the slope
+        # endpoints are O(1) index reads, with no per-chunk eviction or
+        # slice allocation at all
+        self._rms_ring = np.zeros(self.rms_window_size, dtype=np.float32)
+        self._rms_write = 0  # next write position in the ring
+        self._rms_filled = 0  # valid samples currently in the ring
         self.noise_floor = 0.001  # Running estimate of background noise level
         self.noise_floor_alpha = 0.002  # Smoothing factor for noise floor update (very slow adaptation)
         self.adaptive_threshold_factor = 7.0  # Multiplier above noise floor (reduced from 10.0)
@@ -103,8 +204,20 @@ class AudioAnalyzer:
         self.min_loud_frames = 6  # Must be loud for at least 6 consecutive frames (reduced from 8)
         self.consecutive_loud_frames = 0  # Counter for consecutive frames above loudness threshold
 
-        # Performance metrics
-        self.detected_pitches: List[float] = []
+        # Performance metrics: detected pitches in a preallocated float32
+        # array grown by doubling, so a long take appends in place instead
+        # of boxing a Python float per detection
+        self._pitches = np.empty(4096, dtype=np.float32)
+        self._n_pitches = 0
+
+        if _acf_peak_kernel is not None:
+            # Trigger JIT compilation here rather than on the first chunk
+            _acf_peak_kernel(np.ones(64, dtype=np.float64), 1, 32, 0.3, 64.0)
+            _pcm16_to_float(
+                np.zeros(8, dtype=np.int16),
+                np.empty(8, dtype=np.float32),
+                _PCM_SCALE,
+            )
 
     def add_audio_chunk(self, chunk: bytes) -> Dict[str, Any]:
         """
@@ -140,23 +253,35 @@ class AudioAnalyzer:
             if len(audio_data) == 0:
                 return {"status": "empty"}
 
-            # Normalize to [-1, 1]
-            audio_float = audio_data.astype(np.float32) / 32768.0
+            # Normalize to [-1, 1]: one fused multiply straight into the
+            # reusable scratch, instead of an astype pass plus a divide
+            # pass each allocating a full-size temporary
+            n = len(audio_data)
+            if n > self._scratch.size:
+                self._scratch = np.empty(n, dtype=np.float32)
+            audio_float = self._scratch[:n]
+            if _pcm16_to_float is not None:
+                _pcm16_to_float(audio_data, audio_float, _PCM_SCALE)
+            else:
+                np.multiply(audio_data, _PCM_SCALE, out=audio_float, casting="unsafe")
 
-            # Calculate RMS (Root Mean Square) - represents volume/energy
-            rms = np.sqrt(np.mean(audio_float ** 2))
+            # Calculate RMS (Root Mean Square) - represents volume/energy.
+            # np.dot fuses square-and-sum in one BLAS pass with no squared
+            # temporary. Invariant: rms and everything derived from it in
+            # the onset block below (noise floor, thresholds, slope) are
+            # plain Python floats — _recent_rms unboxes its float32 reads —
+            # so per-chunk scalar arithmetic never dispatches through
+            # numpy's ufunc machinery.
+            rms: float = math.sqrt(float(np.dot(audio_float, audio_float)) / audio_float.size)
 
             # Adaptive RMS + slope onset detection - very strict criteria with loudness persistence
             current_onset = False
             current_time_seconds = float(self.total_bytes) / float(self.sample_rate * 2)
 
             if not self.onset_detected:
-                # Add current RMS to history
-                self.rms_history.append(rms)
-
-                # Keep only recent history for slope calculation
-                if len(self.rms_history) > self.rms_window_size:
-                    self.rms_history.pop(0)
+                # Add current RMS to the ring; the write index wraps, so the
+                # oldest value is overwritten in place
+                self._push_rms(rms)
 
                 # Update noise floor estimate very conservatively (only for very quiet signals)
                 if rms < self.noise_floor * 1.5:  # Only update if RMS is very close to current floor
@@ -178,56 +303,60 @@ class AudioAnalyzer:
                     rms_slope = 0.0
                     sustained_increase = False
 
-                    if len(self.rms_history) >= 8:  # Require more history for stability
+                    if self._rms_filled >= 8:  # Require more history for stability
                         # Use more samples for slope calculation for stability
                         recent_samples = 8
-                        recent_rms = self.rms_history[-recent_samples:]
                         # Linear regression slope approximation: (y2 - y1) / (x2 - x1)
-                        rms_slope = (recent_rms[-1] - recent_rms[0]) / (recent_samples - 1)
+                        # Ring endpoint reads: O(1) index arithmetic, no slice
+                        rms_slope = (
+                            self._recent_rms(1) - self._recent_rms(recent_samples)
+                        ) / (recent_samples - 1)
 
                         # Check for sustained increase - require multiple consecutive increases
-                        if len(recent_rms) >= self.min_sustained_samples:
-                            increases = 0
-                            for i in range(1, self.min_sustained_samples):
-                                if recent_rms[-i] > recent_rms[-(i+1)]:
-                                    increases += 1
-                            sustained_increase = increases >= (self.min_sustained_samples - 2)  # Allow 1 decrease
+                        increases = 0
+                        for i in range(1, self.min_sustained_samples):
+                            if self._recent_rms(i) > self._recent_rms(i + 1):
+                                increases += 1
+                        sustained_increase = increases >= (self.min_sustained_samples - 2)  # Allow 1 decrease
 
                     # Slightly less strict onset criteria: ALL must be satisfied + loudness persistence
                     if (rms > adaptive_threshold and           # High amplitude threshold
                         rms_slope > self.min_slope_threshold and  # Strong positive slope
                         sustained_increase and                # Sustained energy increase
-                        len(self.rms_history) >= 20 and     # Need substantial history
+                        self._rms_filled >= 20 and          # Need substantial history
                         rms > self.noise_floor * 6.0):      # Reduced secondary amplitude check (from 8.0)
 
                         self.onset_detected = True
                         self.onset_time = current_time_seconds
                         current_onset = True
-                        print(f"[AudioAnalyzer] Onset detected at {current_time_seconds:.2f}s")
-                        print(f"  RMS: {rms:.4f}, Threshold: {adaptive_threshold:.4f}, Noise floor: {self.noise_floor:.4f}")
-                        print(f"  RMS slope: {rms_slope:.6f}, Min slope: {self.min_slope_threshold:.6f}")
-                        print(f"  Sustained increase: {sustained_increase}, History length: {len(self.rms_history)}")
-                        print(f"  Consecutive loud frames: {self.consecutive_loud_frames}/{self.min_loud_frames}")
+                        if logger.isEnabledFor(logging.DEBUG):
+                            logger.debug("Onset detected at %.2fs", current_time_seconds)
+                            logger.debug("  RMS: %.4f, Threshold: %.4f, Noise floor: %.4f", rms, adaptive_threshold, self.noise_floor)
+                            logger.debug("  RMS slope: %.6f, Min slope: %.6f", rms_slope, self.min_slope_threshold)
+                            logger.debug("  Sustained increase: %s, History length: %d", sustained_increase, self._rms_filled)
+                            logger.debug("  Consecutive loud frames: %d/%d", self.consecutive_loud_frames, self.min_loud_frames)
                 else:
                     # Not loud enough for long enough - don't even consider onset
                     pass
 
-            # Accumulate samples for pitch detection
-            self.pitch_detection_buffer = np.concatenate([self.pitch_detection_buffer, audio_float])
-
-            # Only attempt pitch detection when we have enough samples
+            # Accumulate samples for pitch detection in the ring; only
+            # attempt detection when a full window is ready. Near-silent
+            # chunks are gated out entirely — no ring copy, no FFT — since
+            # silence dominates real recordings and can never yield a pitch.
             pitch = None
-            if len(self.pitch_detection_buffer) >= self.min_samples_for_pitch:
-                pitch = self._detect_pitch(self.pitch_detection_buffer)
+            if (rms >= self.noise_floor * self.loudness_threshold_factor
+                    and self._push_pitch_samples(audio_float)):
+                pitch = self._detect_pitch(self._pitch_window_view())
 
                 if pitch is not None and pitch > 0:
-                    # store as Python float to avoid numpy types when serializing
-                    self.detected_pitches.append(float(pitch))
+                    if self._n_pitches == self._pitches.size:
+                        self._pitches = np.resize(self._pitches, 2 * self._pitches.size)
+                    self._pitches[self._n_pitches] = pitch
+                    self._n_pitches += 1
 
-                # Keep only the most recent samples in the buffer (sliding window)
+                # Logically drop the oldest half of the window
                 # Keep 50% overlap for better continuity
-                keep_samples = self.min_samples_for_pitch // 2
-                self.pitch_detection_buffer = self.pitch_detection_buffer[-keep_samples:]
+                self._pitch_filled = self.min_samples_for_pitch // 2
 
             # Prepare analysis results
             result = {
@@ -243,6 +372,62 @@ class AudioAnalyzer:
         except Exception as e:
             return {"status": "error", "message": str(e)}
 
+    def pitch_array(self) -> np.ndarray:
+        """View of the pitches detected so far (no copy)."""
+        return self._pitches[:self._n_pitches]
+
+    def _push_rms(self, rms: float) -> None:
+        """Append an RMS value to the ring, overwriting the oldest."""
+        self._rms_ring[self._rms_write] = rms
+        self._rms_write = (self._rms_write + 1) % self.rms_window_size
+        if self._rms_filled < self.rms_window_size:
+            self._rms_filled += 1
+
+    def _recent_rms(self, age: int) -> float:
+        """RMS value `age` samples back (age=1 is the newest)."""
+        return float(self._rms_ring[(self._rms_write - age) % self.rms_window_size])
+
+    def _push_pitch_samples(self, samples: np.ndarray) -> bool:
+        """
+        Copy samples into the pitch ring without allocating.
+
+        Args:
+            samples: Normalized float32 audio samples
+
+        Returns:
+            True when a full detection window is available
+        """
+        n = self.min_samples_for_pitch
+        k = len(samples)
+
+        if k >= n:
+            # The chunk alone fills the window; keep its tail
+            self._pitch_ring[:] = samples[-n:]
+            self._pitch_write = 0
+            self._pitch_filled = n
+            return True
+
+        end = self._pitch_write + k
+        if end <= n:
+            self._pitch_ring[self._pitch_write:end] = samples
+        else:
+            # Wrap: split copy across the ring boundary
+            split = n - self._pitch_write
+            self._pitch_ring[self._pitch_write:] = samples[:split]
+            self._pitch_ring[:end - n] = samples[split:]
+
+        self._pitch_write = end % n
+        self._pitch_filled = min(n, self._pitch_filled + k)
+        return self._pitch_filled >= n
+
+    def _pitch_window_view(self) -> np.ndarray:
+        """Unroll the ring, oldest sample first, into the scratch window."""
+        n = self.min_samples_for_pitch
+        w = self._pitch_write
+        self._pitch_window[:n - w] = self._pitch_ring[w:]
+        self._pitch_window[n - w:] = self._pitch_ring[:w]
+        return self._pitch_window
+
     def _detect_pitch(self, audio_data: np.ndarray) -> Optional[float]:
         """
         Detect the fundamental frequency (pitch) using autocorrelation.
@@ -255,18 +440,18 @@ class AudioAnalyzer:
         """
         # Check signal strength
         max_amplitude = np.max(np.abs(audio_data))
-        rms = np.sqrt(np.mean(audio_data ** 2))
 
         # Skip if signal is too quiet (very low threshold)
         if max_amplitude < 0.002:  # Even lower threshold
             return None
 
-        # Autocorrelation
-        correlation = np.correlate(audio_data, audio_data, mode='full')
-        correlation = correlation[len(correlation) // 2:]
-
-        # Normalize correlation
-        correlation = correlation / correlation[0] if correlation[0] > 0 else correlation
+        # Autocorrelation via Wiener-Khinchin: O(N log N) instead of the
+        # O(N^2) time-domain np.correlate. Zero-pad to the next power of
+        # two past 2N-1 so the circular convolution equals the linear one.
+        n = len(audio_data)
+        fft_size = 1 << (2 * n - 1).bit_length()
+        spectrum = np.fft.rfft(audio_data, n=fft_size)
+        correlation = np.fft.irfft(spectrum * np.conj(spectrum), n=fft_size)[:n]
 
         # Define search range for musical pitches (roughly 50 Hz to 2000 Hz)
         min_period = int(self.sample_rate / 2000)  # Max frequency
@@ -275,6 +460,19 @@ class AudioAnalyzer:
         if max_period >= len(correlation):
             return None
 
+        # Compiled kernel when numba is installed: normalization and peak
+        # scan fused into typed loops, no intermediate arrays
+        if _acf_peak_kernel is not None:
+            frequency = _acf_peak_kernel(
+                correlation, min_period, max_period, 0.3, float(self.sample_rate)
+            )
+            return float(frequency) if frequency > 0 else None
+
+        # Vectorized numpy fallback below
+
+        # Normalize correlation
+        correlation = correlation / correlation[0] if correlation[0] > 0 else correlation
+
         # Find peak in valid range
         search_range = correlation[min_period:max_period]
         if len(search_range) == 0:
@@ -283,19 +481,18 @@ class AudioAnalyzer:
         # Find the first significant peak (not just the maximum)
         # Look for peaks above a threshold
         peak_threshold = 0.3  # Correlation must be at least 30% of max
-        peak_index = None
-
-        for i in range(1, len(search_range) - 1):
-            # Check if this is a local maximum above threshold
-            if (search_range[i] > search_range[i-1] and
-                search_range[i] > search_range[i+1] and
-                search_range[i] > peak_threshold):
-                peak_index = i + min_period
-                break
 
-        # If no significant peak found, use the global maximum
-        if peak_index is None:
-            peak_index = np.argmax(search_range) + min_period
+        # Local maxima above threshold via three shifted-slice comparisons
+        # instead of a Python loop over every lag
+        s = search_range
+        peaks = (s[1:-1] > s[:-2]) & (s[1:-1] > s[2:]) & (s[1:-1] > peak_threshold)
+        peak_candidates = np.flatnonzero(peaks)
+
+        if peak_candidates.size:
+            peak_index = int(peak_candidates[0]) + 1 + min_period
+        else:
+            # If no significant peak found, use the global maximum
+            peak_index = int(np.argmax(search_range)) + min_period
 
         # Convert period to frequency
         if peak_index > 0:
@@ -314,30 +511,31 @@ class AudioAnalyzer:
         Returns:
             Dictionary with performance statistics
         """
-        avg_pitch = None
-        if self.detected_pitches:
-            avg_pitch = np.mean(self.detected_pitches)
+        pitches = self.pitch_array()
+        avg_pitch = float(pitches.mean()) if pitches.size else None
 
         return {
             "total_duration_seconds": float(self.total_bytes) / float(self.sample_rate * 2),
             "total_bytes_received": int(self.total_bytes),
             "onset_detected": self.onset_detected,
             "onset_time": float(self.onset_time) if self.onset_time else None,
-            "detected_pitches": list(self.detected_pitches)[:10],  # First 10 for brevity
-            "average_pitch_hz": float(avg_pitch) if avg_pitch else None,
-            "num_pitch_detections": int(len(self.detected_pitches)),
+            "detected_pitches": pitches[:10].tolist(),  # First 10 for brevity
+            "average_pitch_hz": avg_pitch,
+            "num_pitch_detections": int(pitches.size),
         }
 
     def reset(self):
         """Reset the analyzer state."""
         self.total_bytes = 0
-        self.pitch_detection_buffer = np.array([], dtype=np.float32)
+        self._pitch_write = 0
+        self._pitch_filled = 0
         self.onset_detected = False
         self.onset_time = None
-        self.detected_pitches.clear()
+        self._n_pitches = 0
 
         # Reset adaptive onset detection state
-        self.rms_history.clear()
+        self._rms_write = 0
+        self._rms_filled = 0
         self.noise_floor = 0.001
         self.consecutive_loud_frames = 0
 
@@ -363,13 +561,22 @@ class PerformanceAnalyzer:
         # Load the excerpt score
         self.excerpt: Optional[ExcerptModel] = None
         self.expected_notes: List[Dict[str, Any]] = []
+
+        # Struct-of-arrays view of the expected notes: analyze_chunk still
+        # scalar-indexes the dict list, but batch scoring wants contiguous
+        # arrays it can compare against in one vectorized pass.
+        self.expected_pitch_names: List[str] = []
+        self.expected_freqs = np.empty(0, dtype=np.float32)
+        self.expected_offsets = np.empty(0, dtype=np.float64)
+        self.expected_durations = np.empty(0, dtype=np.float64)
+
         self.current_note_index = 0
         self.tempo = 120  # Default tempo, will be set from frontend
 
         try:
             self._load_excerpt(excerpt_id)
         except Exception as e:
-            print(f"Warning: Could not load excerpt {excerpt_id}: {e}")
+            logger.warning("Could not load excerpt %s: %s", excerpt_id, e)
 
     def _load_excerpt(self, excerpt_id: str):
         """
@@ -393,11 +600,35 @@ class PerformanceAnalyzer:
                 file_path = excerpts_dir / f"{excerpt_id}.musicxml"
 
             if file_path.exists():
-                # Parse the excerpt
-                self.excerpt = parse_excerpt(file_path)
+                # Parse the excerpt (memoized by mtime, so reconnects to the
+                # same excerpt skip the music21 parse)
+                self.excerpt = parse_excerpt_cached(file_path)
 
         if self.excerpt:
-            # Extract notes (skip rests for now)
+            pre = self.excerpt.expected
+            if pre is not None:
+                # Parse time already filtered rests and resolved
+                # frequencies; lift the arrays straight off the model
+                self.expected_notes = [
+                    {
+                        "pitch": p,
+                        "frequency": f,
+                        "duration_quarter": d,
+                        "offset": o,
+                    }
+                    for p, f, d, o in zip(
+                        pre.pitch_names, pre.frequencies,
+                        pre.durations, pre.offsets,
+                    )
+                ]
+                self.expected_pitch_names = list(pre.pitch_names)
+                self.expected_freqs = np.asarray(pre.frequencies, dtype=np.float32)
+                self.expected_offsets = np.asarray(pre.offsets, dtype=np.float64)
+                self.expected_durations = np.asarray(pre.durations, dtype=np.float64)
+                return
+
+            # Fallback for models built without the precomputed arrays:
+            # extract notes (skip rests for now)
             for item in self.excerpt.notes_and_rests:
                 # Check if it's a note (has pitch attribute) and not a rest
                 if hasattr(item, 'pitch'):
@@ -412,6 +643,34 @@ class PerformanceAnalyzer:
                                 "offset": item.offset,
                             })
 
+            # Mirror the dict list into contiguous arrays for batch scoring
+            self.expected_pitch_names = [n["pitch"] for n in self.expected_notes]
+            self.expected_freqs = np.asarray(
+                [n["frequency"] for n in self.expected_notes], dtype=np.float32
+            )
+            self.expected_offsets = np.asarray(
+                [n["offset"] for n in self.expected_notes], dtype=np.float64
+            )
+            self.expected_durations = np.asarray(
+                [n["duration_quarter"] for n in self.expected_notes],
+                dtype=np.float64,
+            )
+
+    def _frequencies_to_notes(self, frequencies: np.ndarray) -> List[str]:
+        """
+        Convert an array of frequencies to nearest note names in one shot.
+
+        Args:
+            frequencies: Frequencies in Hz
+
+        Returns:
+            Note names (e.g., ['A4', 'C#5'])
+        """
+        # One vectorized log2 over the whole batch instead of a numpy
+        # scalar dispatch per frequency
+        midi = np.rint(69 + 12 * np.log2(frequencies / 440.0)).astype(np.int32)
+        return [f"{NOTE_NAMES[m % 12]}{m // 12 - 1}" for m in midi]
+
     def _frequency_to_note(self, frequency: float) -> str:
         """
         Convert frequency to nearest note name.
@@ -425,16 +684,9 @@ class PerformanceAnalyzer:
         if frequency <= 0:
             return "Unknown"
 
-        # Convert frequency to MIDI note number
-        midi_note = 69 + 12 * np.log2(frequency / 440.0)
-        midi_note_rounded = int(round(midi_note))
-
-        # Convert MIDI note to note name
-        note_names = ['C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B']
-        octave = (midi_note_rounded // 12) - 1
-        note_index = midi_note_rounded % 12
-
-        return f"{note_names[note_index]}{octave}"
+        return self._frequencies_to_notes(
+            np.asarray([frequency], dtype=np.float64)
+        )[0]
 
     def set_tempo(self, tempo: int):
         """
@@ -444,7 +696,7 @@ class PerformanceAnalyzer:
             tempo: Tempo in beats per minute
         """
         self.tempo = tempo
-        print(f"[Analyzer] Tempo set to {tempo} BPM")
+        logger.debug("Tempo set to %d BPM", tempo)
 
     def set_current_note_index(self, note_index: int):
         """
@@ -455,9 +707,9 @@ class PerformanceAnalyzer:
         """
         if 0 <= note_index < len(self.expected_notes):
             self.current_note_index = note_index
-            print(f"[Analyzer] Note index updated to {note_index} (pitch: {self.expected_notes[note_index]['pitch']})")
+            logger.debug("Note index updated to %d (pitch: %s)", note_index, self.expected_notes[note_index]["pitch"])
         else:
-            print(f"[Analyzer] Warning: Invalid note index {note_index} (max: {len(self.expected_notes) - 1})")
+            logger.warning("Invalid note index %d (max: %d)", note_index, len(self.expected_notes) - 1)
 
     def analyze_chunk(self, chunk: bytes) -> Dict[str, Any]:
         """
@@ -513,9 +765,13 @@ class PerformanceAnalyzer:
 
             # Only log on onset detection to avoid spam, but always include the data
             if analysis.get("onset_detected"):
-                print(f"[Analyzer] Note {self.current_note_index}: Detected {detected_note} ({detected_freq:.1f} Hz), "
-                      f"Expected {expected_note['pitch']} ({expected_freq:.1f} Hz), "
-                      f"Cents off: {cents_off:.1f}, Accuracy: {accuracy_level}")
+                logger.debug(
+                    "Note %d: Detected %s (%.1f Hz), Expected %s (%.1f Hz), "
+                    "Cents off: %.1f, Accuracy: %s",
+                    self.current_note_index, detected_note, detected_freq,
+                    expected_note["pitch"], expected_freq, cents_off,
+                    accuracy_level,
+                )
 
             analysis["expected_pitch"] = expected_note["pitch"]
             analysis["expected_frequency"] = expected_freq
@@ -528,6 +784,41 @@ class PerformanceAnalyzer:
 
         return analysis
 
+    def score_all(self, detected_freqs: np.ndarray) -> Dict[str, Any]:
+        """
+        Score a batch of detected frequencies against the expected notes.
+
+        Compares every detected pitch to its nearest expected note in one
+        vectorized pass; used for the final report, where the per-chunk
+        note indices are no longer known.
+
+        Args:
+            detected_freqs: Detected frequencies in Hz
+
+        Returns:
+            Dictionary with aggregate intonation statistics
+        """
+        if self.expected_freqs.size == 0 or detected_freqs.size == 0:
+            return {
+                "num_scored": 0,
+                "average_abs_cents_off": None,
+                "in_tune_percentage": None,
+            }
+
+        # Cents between every detected pitch and every expected note; keep
+        # the nearest expected note per detection
+        cents = 1200.0 * (
+            np.log2(detected_freqs[:, None])
+            - np.log2(self.expected_freqs.astype(np.float64)[None, :])
+        )
+        nearest = np.abs(cents).min(axis=1)
+
+        return {
+            "num_scored": int(nearest.size),
+            "average_abs_cents_off": round(float(nearest.mean()), 1),
+            "in_tune_percentage": round(float(np.mean(nearest <= 25.0)) * 100, 1),
+        }
+
     def get_final_report(self) -> Dict[str, Any]:
         """
         Generate final performance report.
@@ -537,6 +828,17 @@ class PerformanceAnalyzer:
         """
         summary = self.audio_analyzer.get_summary()
 
+        # Name the sampled pitches in one vectorized batch
+        if summary.get("detected_pitches"):
+            summary["detected_notes"] = self._frequencies_to_notes(
+                np.asarray(summary["detected_pitches"], dtype=np.float64)
+            )
+
+        # Vectorized intonation scoring over the whole performance
+        summary["intonation"] = self.score_all(
+            self.audio_analyzer.pitch_array().astype(np.float64)
+        )
+
         # Add excerpt-specific metrics
         summary["excerpt_id"] = self.excerpt_id
 
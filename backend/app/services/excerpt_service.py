@@ -1,10 +1,16 @@
 from music21 import converter, note
 from pathlib import Path
+import concurrent.futures
+import functools
+import os
 
-from app.schemas.excerpt_model import ExcerptModel
+from app.schemas.excerpt_model import ExcerptModel, ExpectedNotes
 from app.utils.ids import id_for_path
 
 
+# Both helpers are cached: the answer never changes within a process, and
+# resolve() otherwise re-walks the path with realpath() syscalls per call.
+@functools.cache
 def get_project_root() -> Path:
     """Return the project's root directory.
     Uses the file location to compute the project root.
@@ -12,6 +18,7 @@ def get_project_root() -> Path:
     return Path(__file__).resolve().parents[3]
 
 
+@functools.cache
 def get_excerpts_dir() -> Path:
     """Return the project's data/excerpts directory.
     Uses the file location to compute the project root.
@@ -23,19 +30,20 @@ def _token_from_music21(obj) -> dict:
     """Convert a music21 Note or Rest to a serializable dict matching NoteModel/RestModel."""
     if isinstance(obj, note.Rest):
         return {
-            "pitch": "rest",
+            "kind": "rest",
             "duration_quarter": float(obj.duration.quarterLength),
             "offset": float(obj.offset),
         }
     if isinstance(obj, note.Note):
         pitch = obj.pitch.nameWithOctave if obj.pitch is not None else ""
         return {
+            "kind": "note",
             "pitch": pitch,
             "duration_quarter": float(obj.duration.quarterLength),
             "offset": float(obj.offset),
         }
     # fallback
-    return {"pitch": str(obj), "duration_quarter": 0.0, "offset": 0.0}
+    return {"kind": "note", "pitch": str(obj), "duration_quarter": 0.0, "offset": 0.0}
 
 
 def parse_excerpt(file_path: Path) -> ExcerptModel | None:
@@ -44,11 +52,33 @@ def parse_excerpt(file_path: Path) -> ExcerptModel | None:
     excerpt_id = id_for_path(file_path, project_root)
     if not file_path.exists():
         raise FileNotFoundError(f"File not found: {file_path}")
+    # Local import: analysis_service imports this module at top level, so
+    # the frequency table has to be pulled in lazily to avoid the cycle.
+    from app.services.analysis_service import note_to_frequency
+
     try:
         score = converter.parse(str(file_path))
-        notes_and_rests = [
-            _token_from_music21(n) for n in score.recurse().notesAndRests
-        ]
+
+        # One pass over music21's descriptor-heavy objects: build the
+        # serializable token list and the analyzer's parallel note arrays
+        # together, so nothing downstream iterates the score again.
+        notes_and_rests = []
+        pitch_names: list[str] = []
+        frequencies: list[float] = []
+        offsets: list[float] = []
+        durations: list[float] = []
+
+        for obj in score.recurse().notesAndRests:
+            token = _token_from_music21(obj)
+            notes_and_rests.append(token)
+            if token["kind"] != "note":
+                continue
+            freq = note_to_frequency(token["pitch"])
+            if freq:
+                pitch_names.append(token["pitch"])
+                frequencies.append(freq)
+                offsets.append(token["offset"])
+                durations.append(token["duration_quarter"])
 
         # safe tempo lookup
         tempo_marks = score.metronomeMarkBoundaries()
@@ -80,11 +110,169 @@ def parse_excerpt(file_path: Path) -> ExcerptModel | None:
                 else "Unknown Time Signature"
             ),
             tempo=tempo,
+            expected=ExpectedNotes(
+                pitch_names=pitch_names,
+                frequencies=frequencies,
+                offsets=offsets,
+                durations=durations,
+            ),
         )
     except Exception as e:
         raise ValueError(f"Error parsing MusicXML file: {e}")
 
 
+# Parsed excerpts memoized by path; the stored mtime invalidates an entry
+# when the file changes on disk.
+_EXCERPT_CACHE: dict[str, tuple[int, ExcerptModel | None]] = {}
+
+
+def parse_excerpt_cached(file_path: Path) -> ExcerptModel | None:
+    """Parse a MusicXML file, memoizing the result by (path, mtime).
+
+    MXL parsing means zipfile inflate plus a full music21 parse — dozens of
+    milliseconds per file — so repeat requests for an unchanged file should
+    not pay it again.
+    """
+    key = str(file_path)
+    mtime_ns = file_path.stat().st_mtime_ns
+    cached = _EXCERPT_CACHE.get(key)
+    if cached is not None and cached[0] == mtime_ns:
+        return cached[1]
+    excerpt = parse_excerpt(file_path)
+    _EXCERPT_CACHE[key] = (mtime_ns, excerpt)
+    return excerpt
+
+
+def _parse_or_none(file_path: Path) -> ExcerptModel | None:
+    """parse_excerpt, but swallow per-file failures (pool map helper)."""
+    try:
+        return parse_excerpt(file_path)
+    except Exception:
+        return None
+
+
+# Worker pool for cold parses; created on first use since most requests are
+# fully cache-warm and never need it.
+_PARSE_POOL: concurrent.futures.ProcessPoolExecutor | None = None
+
+
+def _get_parse_pool() -> concurrent.futures.ProcessPoolExecutor:
+    global _PARSE_POOL
+    if _PARSE_POOL is None:
+        _PARSE_POOL = concurrent.futures.ProcessPoolExecutor(
+            max_workers=os.cpu_count()
+        )
+    return _PARSE_POOL
+
+
+def parse_excerpts_bulk(paths: list[Path]) -> list[ExcerptModel]:
+    """Parse many excerpts, farming cold parses out to a process pool.
+
+    music21 parsing is CPU-bound and holds the GIL, so parsing a cold
+    corpus serially scales linearly with its size; processes parallelize
+    it across cores. Files already fresh in the mtime cache skip the
+    pool entirely.
+    """
+    results: dict[str, ExcerptModel | None] = {}
+    cold: list[tuple[Path, int]] = []
+
+    for file_path in paths:
+        key = str(file_path)
+        try:
+            mtime_ns = file_path.stat().st_mtime_ns
+        except OSError:
+            continue
+        cached = _EXCERPT_CACHE.get(key)
+        if cached is not None and cached[0] == mtime_ns:
+            results[key] = cached[1]
+        else:
+            cold.append((file_path, mtime_ns))
+
+    if len(cold) == 1:
+        # Not worth shipping a single file to a worker
+        file_path, mtime_ns = cold[0]
+        excerpt = _parse_or_none(file_path)
+        _EXCERPT_CACHE[str(file_path)] = (mtime_ns, excerpt)
+        results[str(file_path)] = excerpt
+    elif cold:
+        parsed = _get_parse_pool().map(_parse_or_none, [p for p, _ in cold])
+        for (file_path, mtime_ns), excerpt in zip(cold, parsed):
+            _EXCERPT_CACHE[str(file_path)] = (mtime_ns, excerpt)
+            results[str(file_path)] = excerpt
+
+    return [
+        excerpt
+        for file_path in paths
+        if (excerpt := results.get(str(file_path))) is not None
+    ]
+
+
+def build_excerpt_index() -> dict[str, Path]:
+    """Map lowercased excerpts-relative paths (sans suffix) to file paths.
+
+    Built once at startup (and on explicit reindex) so request handlers
+    can resolve titles without a recursive directory walk. Keyed by the
+    instrument-qualified relative path — two instrument folders may hold
+    the same filename, so a bare stem would silently drop one of them.
+    """
+    excerpts_dir = get_excerpts_dir()
+    return {
+        file_path.relative_to(excerpts_dir).with_suffix("").as_posix().lower(): file_path
+        for file_path in excerpts_dir.rglob("*.mxl")
+    }
+
+
+def _excerpts_tree_mtime() -> int | None:
+    """Newest mtime across the excerpts dir and its direct subdirectories.
+
+    Excerpts live one level down (data/excerpts/<instrument>/*.mxl), and a
+    POSIX directory's mtime only changes when its *direct* entries do —
+    adding a file inside clarinet/ bumps clarinet/, not data/excerpts — so
+    the instrument folders have to be statted as well.
+    """
+    excerpts_dir = get_excerpts_dir()
+    try:
+        newest = excerpts_dir.stat().st_mtime_ns
+        for child in excerpts_dir.iterdir():
+            if child.is_dir():
+                newest = max(newest, child.stat().st_mtime_ns)
+    except OSError:
+        return None
+    return newest
+
+
+# Lazily built stem index plus the tree mtime it was built against; a
+# changed mtime triggers a rebuild on next access.
+_STEM_INDEX: dict[str, Path] = {}
+_STEM_INDEX_MTIME: int | None = None
+
+
+def get_stem_index() -> dict[str, Path]:
+    """Return the stem -> path index, rebuilding when the excerpts tree changes."""
+    global _STEM_INDEX, _STEM_INDEX_MTIME
+
+    mtime_ns = _excerpts_tree_mtime()
+
+    if not _STEM_INDEX or mtime_ns != _STEM_INDEX_MTIME:
+        _STEM_INDEX = build_excerpt_index()
+        _STEM_INDEX_MTIME = mtime_ns
+    return _STEM_INDEX
+
+
+def rebuild_stem_index() -> dict[str, Path]:
+    """Rebuild the stem index unconditionally (explicit reindex)."""
+    global _STEM_INDEX, _STEM_INDEX_MTIME
+
+    _STEM_INDEX_MTIME = _excerpts_tree_mtime()
+    _STEM_INDEX = build_excerpt_index()
+    return _STEM_INDEX
+
+
+# Lowercased excerpt title -> file path, filled in as titles are resolved so
+# repeat lookups skip the directory walk entirely.
+_TITLE_TO_PATH: dict[str, Path] = {}
+
+
 def find_excerpt_by_title(title: str) -> ExcerptModel | None:
     """
     Find an excerpt by its title.
@@ -95,25 +283,28 @@ def find_excerpt_by_title(title: str) -> ExcerptModel | None:
     Returns:
         ExcerptModel if found, None otherwise
     """
-    excerpts_dir = get_excerpts_dir()
+    # Normalize once, not per file
+    title_key = title.lower()
 
-    # Search for all MusicXML files
-    for file_path in excerpts_dir.rglob("*.mxl"):
+    known_path = _TITLE_TO_PATH.get(title_key)
+    if known_path is not None and known_path.exists():
         try:
-            excerpt = parse_excerpt(file_path)
-            if excerpt and excerpt.title.lower() == title.lower():
-                return excerpt
+            return parse_excerpt_cached(known_path)
         except Exception:
-            continue
+            pass
 
-    # Try .musicxml extension as well
-    for file_path in excerpts_dir.rglob("*.musicxml"):
-        try:
-            excerpt = parse_excerpt(file_path)
-            if excerpt and excerpt.title.lower() == title.lower():
-                return excerpt
-        except Exception:
-            continue
+    excerpts_dir = get_excerpts_dir()
+
+    # Search for all MusicXML files
+    for pattern in ("*.mxl", "*.musicxml"):
+        for file_path in excerpts_dir.rglob(pattern):
+            try:
+                excerpt = parse_excerpt_cached(file_path)
+                if excerpt and excerpt.title.lower() == title_key:
+                    _TITLE_TO_PATH[title_key] = file_path
+                    return excerpt
+            except Exception:
+                continue
 
     return None
 
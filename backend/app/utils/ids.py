@@ -1,10 +1,23 @@
-import hashlib
+import functools
 import uuid
 from pathlib import Path
 
 PROJECT_NAMESPACE = uuid.UUID("164a4b22-43fb-432d-9e08-d4fd75111901")
 
 
-def id_for_path(file_path: Path, project_root: Path) -> uuid.UUID:
-    rel = file_path.resolve().relative_to(project_root.resolve()).as_posix()
+@functools.lru_cache(maxsize=256)
+def _id_for_path_cached(file_path_str: str, project_root_str: str) -> uuid.UUID:
+    rel = (
+        Path(file_path_str)
+        .resolve()
+        .relative_to(Path(project_root_str).resolve())
+        .as_posix()
+    )
     return uuid.uuid5(PROJECT_NAMESPACE, rel)
+
+
+def id_for_path(file_path: Path, project_root: Path) -> uuid.UUID:
+    # The two resolve() calls each issue a chain of stat()/readlink()
+    # syscalls, and the excerpt corpus is finite — memoize on the string
+    # forms so repeat ids are a dict hit.
+    return _id_for_path_cached(str(file_path), str(project_root))